@@ -1,6 +1,17 @@
 import re
+import os
+import hashlib
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+from urllib.request import urlopen
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
 from bs4 import BeautifulSoup  
-import qrcode                
+import segno
 from io import BytesIO       
 from PIL import Image        
 import feedparser            
@@ -12,35 +23,67 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.carousel import Carousel  
 from kivy.uix.image import AsyncImage, Image as KivyImage  
 from kivy.uix.label import Label  
-from kivy.metrics import dp  
+from kivy.metrics import dp, sp  
 from kivy.uix.scrollview import ScrollView  
 from kivy.core.image import Image as CoreImage
+from kivy.core.text import Label as CoreLabel
 from kivy.uix.progressbar import ProgressBar
 from kivy.animation import Animation
 from kivy.properties import ObjectProperty
-from datetime import datetime
 
 # Constantes
 FEED_URL = "https://fct.ufg.br/feed"
 TITLE_LIMIT = 80  
 DESC_LIMIT = 600  
 UPDATE_INTERVAL = 3600  # 1 hora em segundos
+MIN_LOADING_TIME = 0.5  # Tempo mínimo da tela de carregamento, em segundos
+IMAGE_CACHE_DIR = Path(tempfile.gettempdir()) / 'noticias_img'  # Imagens já baixadas
 
+# O texto das entradas já é limpo por clean_text; dispensa a sanitização e a
+# resolução de URLs relativas que o feedparser faria em cada descrição
+feedparser.SANITIZE_HTML = 0
+feedparser.RESOLVE_RELATIVE_URIS = 0
+
+# Tags removidas pré-definidas, reaproveitadas a cada notícia
+_STRIP_TAGS = ('script', 'style')
+
+# Busca direta pelo primeiro <img src>, evitando montar a árvore HTML
+_IMG_SRC_RE = re.compile(r'<img\b[^>]*?\bsrc=["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Domínio grudado na frente de uma URL já absoluta (ex.: "https://fct.ufg.brhttps://...")
+_BAD_PREFIX = re.compile(r'^https?://fct\.ufg\.br(?=https?:)')
+
+# Threads que geram os QR codes sem bloquear a interface
+_QR_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Threads que preparam o texto e a imagem de cada notícia
+_PARSE_POOL = ThreadPoolExecutor(max_workers=4)
+
+@lru_cache(maxsize=128)
+def render_qr_png(url):
+    """
+    Gera o QR code para a URL fornecida e retorna os bytes do PNG.
+    Não usa OpenGL, então pode rodar fora da thread da interface.
+    """
+    buffer = BytesIO()
+    segno.make(url, error='L', micro=False).save(buffer, kind='png', scale=6, border=5)
+    return buffer.getvalue()
+
+@lru_cache(maxsize=128)
 def create_qr_code(url):
     """
     Cria um QR code para a URL fornecida e retorna como textura Kivy.
+    A textura fica em cache por URL e é compartilhada entre as atualizações.
+    Deve ser chamada na thread da interface.
     """
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(url)
-    qr.make(fit=True)
-    
-    img_pil = qr.make_image(fill_color="black", back_color="white")
-    
-    buffer = BytesIO()
-    img_pil.save(buffer, format='PNG')
-    buffer.seek(0)
-    
-    return CoreImage(BytesIO(buffer.read()), ext='png').texture
+    return CoreImage(BytesIO(render_qr_png(url)), ext='png').texture
+
+def _on_qr_rendered(qr_image, url, future):
+    """
+    Chamada quando o PNG do QR code fica pronto; aplica a textura na thread da interface.
+    """
+    if future.exception() is None:
+        Clock.schedule_once(lambda dt: setattr(qr_image, 'texture', create_qr_code(url)))
 
 def clean_text(html_content):
     """
@@ -50,15 +93,18 @@ def clean_text(html_content):
     if not html_content:
         return ""
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Texto sem tags (como os títulos) dispensa o parser: só decodifica entidades e espaços
+    if '<' not in html_content:
+        return ' '.join(unescape(html_content).split())
+    
+    soup = BeautifulSoup(html_content, 'lxml')
     
-    for script in soup(["script", "style"]):
+    for script in soup(_STRIP_TAGS):
         script.decompose()
     
     text = soup.get_text(separator=' ', strip=True)
     
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return ' '.join(text.split())
 
 def truncate_text(text, limit):
     """
@@ -67,30 +113,86 @@ def truncate_text(text, limit):
     if len(text) <= limit:
         return text
     
-    truncated = text[:limit]
-    last_space = truncated.rfind(' ')
-    if last_space > 0:
-        truncated = truncated[:last_space]
-    return truncated + '...'
+    # rfind com limite final dispensa a fatia intermediária text[:limit]
+    last_space = text.rfind(' ', 0, limit)
+    return (text[:last_space] if last_space > 0 else text[:limit]) + '...'
 
 def fix_image_url(url):
     """
     Corrige URLs de imagem que estejam concatenadas incorretamente com o domínio.
     """
-    if url.startswith(("http://fct.ufg.brhttps:", "https://fct.ufg.brhttps:")):
-        return url.replace("http://fct.ufg.br", "").replace("https://fct.ufg.br", "")
-    return url
+    return _BAD_PREFIX.sub('', url, count=1)
 
 def extract_image(description):
     """
-    Extrai a primeira imagem válida da descrição usando BeautifulSoup.
+    Extrai a primeira imagem válida da descrição com uma regex pré-compilada.
+    Endereços relativos são resolvidos aqui, já que o feedparser não os resolve mais.
     """
-    soup = BeautifulSoup(description, 'html.parser')
-    img_tag = soup.find('img')
-    if img_tag and img_tag.get('src'):
-        return fix_image_url(img_tag['src'])
+    match = _IMG_SRC_RE.search(description or '')
+    if match:
+        return fix_image_url(urljoin(FEED_URL, unescape(match.group(1))))
     return None
 
+@lru_cache(maxsize=1)
+def placeholder_texture():
+    """
+    Renderiza uma única vez o aviso "Sem imagem disponível" e compartilha a textura entre os slides.
+    Deve ser chamada na thread da interface.
+    """
+    label = CoreLabel(text="Sem imagem disponível", font_size=sp(15), color=(0.5, 0.5, 0.5, 1))
+    label.refresh()
+    return label.texture
+
+def _sync_text_size(label, *_):
+    """
+    Ajusta a largura de quebra do texto à largura do rótulo; compartilhada por todos os rótulos.
+    """
+    label.text_size = (label.width, None)
+
+def _sync_height_to_texture(label, *_):
+    """
+    Ajusta a altura do rótulo à altura do texto renderizado.
+    """
+    label.height = label.texture_size[1]
+
+def cache_image(url):
+    """
+    Baixa a imagem da notícia uma única vez para o cache em disco e retorna o caminho local.
+    Retorna None se o download falhar. Roda fora da thread da interface.
+    """
+    # O Kivy escolhe o decodificador pela extensão, então ela é mantida no nome do arquivo
+    suffix = Path(urlparse(url).path).suffix or '.jpg'
+    path = IMAGE_CACHE_DIR / (hashlib.md5(url.encode()).hexdigest() + suffix)
+    if path.exists():
+        return str(path)
+    
+    try:
+        IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with urlopen(url, timeout=15) as response:
+            data = response.read()
+        # Grava em um temporário e renomeia, para nunca deixar um arquivo pela metade no cache
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        return None
+    return str(path)
+
+def _prepare_entry(entry):
+    """
+    Extrai de uma entrada do feed os dados exibidos no slide.
+    Roda fora da thread da interface, então nenhum HTML é processado nela.
+    """
+    description = entry.get("description", "")
+    image_url = extract_image(description)
+    return {
+        "image_url": image_url,
+        "image_path": cache_image(image_url) if image_url else None,
+        "title_text": truncate_text(clean_text(entry.get("title", "")), TITLE_LIMIT),
+        "desc_text": truncate_text(clean_text(description), DESC_LIMIT),
+        "link": entry.get("link", ""),
+    }
+
 class LoadingScreen(BoxLayout):
     """
     Tela de carregamento com barra de progresso animada e mensagem.
@@ -174,7 +276,7 @@ class Header(BoxLayout):
 
 class NewsSlide(BoxLayout):
     """
-    Classe que representa um slide de notícia.
+    Classe que representa um slide de notícia, montado a partir de _prepare_entry.
     """
     def __init__(self, entry, **kwargs):
         super().__init__(**kwargs)
@@ -188,8 +290,17 @@ class NewsSlide(BoxLayout):
             size_hint_x=0.4
         )
         
-        image_url = extract_image(entry.get("description", ""))
-        if image_url:
+        image_url = entry["image_url"]
+        if entry["image_path"]:
+            # Imagem já no cache em disco: carrega do arquivo local, sem nova requisição;
+            # o AsyncImage decodifica o arquivo na thread do Loader, fora da interface
+            img = AsyncImage(
+                source=entry["image_path"],
+                size_hint=(1, 1),
+                fit_mode='contain'
+            )
+            image_container.add_widget(img)
+        elif image_url:
             img = AsyncImage(
                 source=image_url,
                 size_hint=(1, 1),
@@ -197,9 +308,9 @@ class NewsSlide(BoxLayout):
             )
             image_container.add_widget(img)
         else:
-            placeholder = Label(
-                text="Sem imagem disponível",
-                color=(0.5, 0.5, 0.5, 1)
+            placeholder = KivyImage(
+                texture=placeholder_texture(),
+                size_hint=(1, 1)
             )
             image_container.add_widget(placeholder)
         
@@ -220,9 +331,8 @@ class NewsSlide(BoxLayout):
         )
         text_layout.bind(minimum_height=text_layout.setter('height'))
         
-        title_text = truncate_text(clean_text(entry.get("title", "")), TITLE_LIMIT)
         title_label = Label(
-            text=title_text,
+            text=entry["title_text"],
             font_size=dp(28),
             bold=True,
             color=(0, 0, 0, 1),
@@ -231,28 +341,24 @@ class NewsSlide(BoxLayout):
             halign='justify',
             valign='middle'
         )
-        title_label.bind(size=lambda *_: setattr(title_label, 'text_size', (title_label.width, None)))
+        title_label.bind(size=_sync_text_size)
         text_layout.add_widget(title_label)
         
-        desc_text = truncate_text(clean_text(entry.get("description", "")), DESC_LIMIT)
         desc_label = Label(
-            text=desc_text,
+            text=entry["desc_text"],
             font_size=dp(26),
             color=(0, 0, 0, 0.8),
             size_hint_y=None,
             halign='justify',
             valign='top'
         )
-        desc_label.bind(
-            size=lambda *_: setattr(desc_label, 'text_size', (desc_label.width, None)),
-            texture_size=lambda *_: setattr(desc_label, 'height', desc_label.texture_size[1])
-        )
+        desc_label.bind(size=_sync_text_size, texture_size=_sync_height_to_texture)
         text_layout.add_widget(desc_label)
         
         spacer = BoxLayout(size_hint_y=None, height=dp(20))
         text_layout.add_widget(spacer)
         
-        link = entry.get("link", "")
+        link = entry["link"]
         if link:
             bottom_container = BoxLayout(
                 orientation='horizontal',
@@ -276,7 +382,7 @@ class NewsSlide(BoxLayout):
                 halign='right',
                 valign='bottom'
             )
-            read_more_label.bind(size=lambda *_: setattr(read_more_label, 'text_size', (read_more_label.width, None)))
+            read_more_label.bind(size=_sync_text_size)
             
             link_label = Label(
                 text=link,
@@ -287,15 +393,15 @@ class NewsSlide(BoxLayout):
                 halign='right',
                 valign='top'
             )
-            link_label.bind(size=lambda *_: setattr(link_label, 'text_size', (link_label.width, None)))
+            link_label.bind(size=_sync_text_size)
             
             read_more_container.add_widget(read_more_label)
             read_more_container.add_widget(link_label)
             
-            qr_texture = create_qr_code(link)
-            qr_image = KivyImage(
-                texture=qr_texture,
-                size_hint_x=0.4
+            # O QR code é gerado em segundo plano; a textura chega via Clock
+            qr_image = KivyImage(size_hint_x=0.4)
+            _QR_POOL.submit(render_qr_png, link).add_done_callback(
+                partial(_on_qr_rendered, qr_image, link)
             )
             
             bottom_container.add_widget(read_more_container)
@@ -305,6 +411,53 @@ class NewsSlide(BoxLayout):
         text_container.add_widget(text_layout)
         self.add_widget(text_container)
 
+class LazySlide(BoxLayout):
+    """
+    Espaço reservado de um slide; o NewsSlide só é montado quando vai aparecer.
+    """
+    def __init__(self, entry, **kwargs):
+        super().__init__(**kwargs)
+        self.entry = entry
+        self.built = False
+    
+    def materialize(self):
+        """
+        Monta o NewsSlide real na primeira vez que o slide é exibido.
+        """
+        if not self.built:
+            self.add_widget(NewsSlide(self.entry))
+            self.built = True
+
+class NewsCarousel(Carousel):
+    """
+    Carousel que monta os slides sob demanda: o atual e os vizinhos visíveis.
+    Com loop=True o Carousel também posiciona o slide anterior, então ele é montado junto.
+    """
+    released = False  # Slides já repassados a outro carousel: não monta mais nada
+    
+    def on_index(self, *args):
+        super().on_index(*args)
+        if not self.released and self.index is not None:
+            self.ensure_slide(self.index - 1)
+            self.ensure_slide(self.index)
+            self.ensure_slide(self.index + 1)
+    
+    def release_slides(self):
+        """
+        Remove todos os slides pelo próprio Carousel, liberando-os para outro carousel.
+        """
+        self.released = True
+        self.clear_widgets()
+    
+    def ensure_slide(self, index):
+        """
+        Garante que o slide na posição indicada (com volta nas duas pontas) esteja montado.
+        """
+        if self.slides and index is not None:
+            slide = self.slides[index % len(self.slides)]
+            if isinstance(slide, LazySlide):
+                slide.materialize()
+
 class NewsContainer(BoxLayout):
     """
     Container principal para as notícias.
@@ -344,7 +497,11 @@ class NoticiasApp(App):
         super().__init__(**kwargs)
         self.carousel = None
         self.container = None
-        self.last_update = None
+        self._etag = None
+        self._modified = None
+        self._slide_cache = {}  # Slides reaproveitados entre atualizações, por link
+        self._loading_started = 0.0
+        self._carousel_tick = None  # Troca automática de slides do carousel atual
     
     def build(self):
         Window.clearcolor = (0.95, 0.95, 0.95, 1)
@@ -352,25 +509,30 @@ class NoticiasApp(App):
         
         self.container = NewsContainer()
         
-        Clock.schedule_once(self.update_news, 2)
+        Clock.schedule_once(self.update_news)
         
-        Clock.schedule_interval(self.check_for_updates, 60)
+        Clock.schedule_interval(self.update_news, UPDATE_INTERVAL)
         
         return self.container
     
-    def create_carousel(self):
+    def create_carousel(self, entries, error=None):
         """
-        Cria um novo carousel com as notícias.
+        Cria um novo carousel com as notícias já baixadas e preparadas.
         """
-        carousel = Carousel(
+        # Para o carousel anterior e solta seus slides antes de reaproveitá-los
+        if self.carousel is not None:
+            self._stop_carousel()
+            self.carousel.release_slides()
+        
+        carousel = NewsCarousel(
             direction='right',
             loop=True,
             size_hint=(1, 1)
         )
         
         try:
-            feed = feedparser.parse(FEED_URL)
-            entries = feed.entries
+            if error is not None:
+                raise error
             
             if not entries:
                 carousel.add_widget(Label(
@@ -379,10 +541,24 @@ class NoticiasApp(App):
                     color=(0, 0, 0, 1)
                 ))
             else:
+                slide_cache = {}
                 for entry in entries:
-                    carousel.add_widget(NewsSlide(entry))
+                    # Reaproveita o slide de uma notícia que não mudou desde a última atualização
+                    slide = self._slide_cache.pop(entry["link"], None)
+                    if slide is None or slide.entry != entry:
+                        slide = LazySlide(entry)
+                    
+                    if entry["link"]:
+                        slide_cache[entry["link"]] = slide
+                    carousel.add_widget(slide)
+                self._slide_cache = slide_cache
+                
+                # on_index disparou com apenas um slide: monta agora o último, o primeiro e o segundo
+                carousel.ensure_slide(-1)
+                carousel.ensure_slide(0)
+                carousel.ensure_slide(1)
             
-            Clock.schedule_interval(lambda dt: carousel.load_next(), 10)
+            self._carousel_tick = Clock.schedule_interval(lambda dt: carousel.load_next(), 10)
             
         except Exception as e:
             carousel.add_widget(Label(
@@ -396,28 +572,74 @@ class NoticiasApp(App):
     def update_news(self, dt):
         """
         Atualiza as notícias.
+        A tela de carregamento só aparece de início; depois, apenas se o feed mudar.
         """
-        self.container.show_loading_screen()
+        if self.carousel is None:
+            self.show_loading()
         
-        Clock.schedule_once(self.finish_update, 2)
+        threading.Thread(target=self._fetch_feed, daemon=True).start()
+    
+    def _fetch_feed(self):
+        """
+        Baixa e interpreta o feed em segundo plano, sem bloquear a interface.
+        Envia ETag/Last-Modified para que um feed inalterado volte como 304, sem corpo.
+        """
+        try:
+            feed = feedparser.parse(FEED_URL, etag=self._etag, modified=self._modified)
+            if feed.get('status') == 304:
+                return  # Feed inalterado: mantém o carousel atual
+            
+            entries, error = list(_PARSE_POOL.map(_prepare_entry, feed.entries)), None
+            
+            # Só guarda os validadores depois que as entradas foram preparadas: se algo
+            # falhar antes, a próxima atualização baixa o feed de novo em vez de receber 304
+            self._etag = feed.get('etag')
+            self._modified = feed.get('modified')
+        except Exception as e:
+            entries, error = None, e
         
-        self.last_update = datetime.now()
+        Clock.schedule_once(lambda dt: self._apply_feed(entries, error))
     
-    def finish_update(self, dt):
+    def _stop_carousel(self):
         """
-        Finaliza a atualização.
+        Cancela a troca automática e a animação em curso do carousel atual.
         """
-        self.carousel = self.create_carousel()
-        self.container.show_carousel(self.carousel)
+        if self._carousel_tick is not None:
+            self._carousel_tick.cancel()
+            self._carousel_tick = None
+        if self.carousel is not None:
+            Animation.cancel_all(self.carousel)
     
-    def check_for_updates(self, dt):
+    def on_stop(self):
         """
-        Verifica se é hora de atualizar as notícias.
+        Cancela a troca automática de slides ao fechar o aplicativo.
         """
-        if self.last_update:
-            time_diff = (datetime.now() - self.last_update).total_seconds()
-            if time_diff >= UPDATE_INTERVAL:
-                self.update_news(None)
+        self._stop_carousel()
+    
+    def show_loading(self):
+        """
+        Exibe a tela de carregamento e marca quando ela apareceu.
+        """
+        self.container.show_loading_screen()
+        self._loading_started = time.monotonic()
+    
+    def _apply_feed(self, entries, error=None):
+        """
+        Finaliza a atualização na thread da interface, assim que o feed chega.
+        Se o feed chegou muito rápido, espera só o restante de MIN_LOADING_TIME.
+        """
+        if not isinstance(self.container.current_widget, LoadingScreen):
+            # Feed novo com o carousel na tela: para o carousel e exibe o carregamento antes de montar
+            self._stop_carousel()
+            self.show_loading()
+        
+        remaining = MIN_LOADING_TIME - (time.monotonic() - self._loading_started)
+        if remaining > 0:
+            Clock.schedule_once(lambda dt: self._apply_feed(entries, error), remaining)
+            return
+        
+        self.carousel = self.create_carousel(entries, error)
+        self.container.show_carousel(self.carousel)
 
 if __name__ == '__main__':
     NoticiasApp().run()
\ No newline at end of file
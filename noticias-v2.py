@@ -1,16 +1,17 @@
 import sys
 import math
 import re
+import html
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
 from datetime import datetime
 from io import BytesIO
-import requests
-from bs4 import BeautifulSoup
-import qrcode
-import feedparser
-from PIL import Image as PILImage
+# feedparser, qrcode, requests, selectolax e PIL são importados sob demanda
+# nas funções que os usam, para a janela aparecer mais rápido
 
-from PyQt6.QtCore import QUrl, QTimer, Qt, QDateTime, QPointF, QThread, pyqtSignal, QSize
+from PyQt6.QtCore import (QUrl, QTimer, Qt, QDateTime, QPointF, QThread, pyqtSignal, QSize,
+                          QObject, QRunnable, QThreadPool)
 from PyQt6.QtGui import QKeySequence, QPainter, QPolygonF, QColor, QFont, QPixmap, QImage
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                            QLabel, QScrollArea, QGridLayout, QFrame)
@@ -27,14 +28,41 @@ UPDATE_INTERVAL = 3600  # 1 hora em segundos
 # Constantes para dimensões de imagem
 IMAGE_WIDTH = 600  # A largura da imagem
 IMAGE_HEIGHT = 700  # Altura para proporção 3:4
+IMAGE_WORKERS = 8  # Downloads de imagem simultâneos
+
+# Sessão HTTP compartilhada: reaproveita conexões TLS entre downloads de imagem
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+# Pool persistente para o pré-carregamento: threads criadas uma vez e reaproveitadas
+_IMAGE_POOL = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix='imagens')
+
+# Padrões pré-compilados usados na limpeza do HTML
+_STRIP_TAGS = "script, style"
+_IMG_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)', re.I)
 
 class NewsDownloader(QThread):
     """Thread para baixar notícias sem bloquear a interface"""
     news_ready = pyqtSignal(list)
     
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Validadores HTTP e notícias da busca anterior, para GET condicional
+        self._etag = None
+        self._modified = None
+        self._entries = []
+    
     def run(self):
         try:
-            feed = feedparser.parse(FEED_URL)
+            import feedparser
+            
+            feed = feedparser.parse(FEED_URL, etag=self._etag, modified=self._modified)
+            
+            # 304: o feed não mudou desde a última busca
+            if feed.get('status') == 304 and self._entries:
+                self.news_ready.emit(self._entries)
+                return
+            
             processed_entries = []
             
             for entry in feed.entries:
@@ -45,25 +73,44 @@ class NewsDownloader(QThread):
                     'image_url': self.extract_image(entry.get('description', ''))
                 }
                 processed_entries.append(processed_entry)
-                
+            
+            self.prefetch_images(processed_entries)
+            if processed_entries:
+                self._etag = feed.get('etag')
+                self._modified = feed.get('modified')
+                self._entries = processed_entries
             self.news_ready.emit(processed_entries)
         except Exception as e:
             print(f"Erro ao obter notícias: {str(e)}")
             self.news_ready.emit([])
     
+    def prefetch_images(self, entries):
+        """Baixa em paralelo as imagens de todas as notícias antes de exibi-las"""
+        futures = {
+            _IMAGE_POOL.submit(fetch_image, entry['image_url']): entry
+            for entry in entries if entry['image_url']
+        }
+        wait(futures)
+        for future, entry in futures.items():
+            qimage = future.result()
+            # Falhas ficam sem 'image' para serem tentadas de novo na exibição
+            if not qimage.isNull():
+                entry['image'] = qimage
+    
     def clean_text(self, html_content):
-        """Limpa e formata o texto HTML usando BeautifulSoup"""
+        """Limpa e formata o texto HTML usando selectolax"""
         if not html_content:
             return ""
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        from selectolax.lexbor import LexborHTMLParser
+        
+        tree = LexborHTMLParser(html_content)
         
-        for script in soup(["script", "style"]):
+        for script in tree.css(_STRIP_TAGS):
             script.decompose()
         
-        text = soup.get_text(separator=' ', strip=True)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        # split() sem argumentos já colapsa qualquer sequência de espaços
+        return ' '.join(tree.text(separator=' ', strip=True).split())
     
     def truncate_text(self, text, limit):
         """Trunca o texto mantendo palavras completas"""
@@ -83,49 +130,115 @@ class NewsDownloader(QThread):
         return url
     
     def extract_image(self, description):
-        """Extrai a primeira imagem válida da descrição usando BeautifulSoup"""
-        soup = BeautifulSoup(description, 'html.parser')
-        img_tag = soup.find('img')
-        if img_tag and img_tag.get('src'):
-            return self.fix_image_url(img_tag['src'])
+        """Extrai a primeira imagem válida da descrição, com selectolax como reserva"""
+        match = _IMG_RE.search(description or '')
+        if match:
+            return self.fix_image_url(html.unescape(match.group(1)))
+        
+        # Marcação incomum (ex.: src sem aspas) fica a cargo do parser completo
+        if '<img' not in (description or '').lower():
+            return None
+        from selectolax.lexbor import LexborHTMLParser
+        img_tag = LexborHTMLParser(description).css_first('img')
+        if img_tag and img_tag.attributes.get('src'):
+            return self.fix_image_url(img_tag.attributes['src'])
         return None
 
-class ImageDownloader(QThread):
-    """Thread para baixar imagens sem bloquear a interface"""
-    image_ready = pyqtSignal(QPixmap)
+def get_session():
+    """Cria na primeira chamada a sessão HTTP compartilhada pelos downloads"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            session = requests.Session()
+            for prefix in ('https://', 'http://'):
+                session.mount(prefix, HTTPAdapter(pool_connections=IMAGE_WORKERS,
+                                                  pool_maxsize=IMAGE_WORKERS, max_retries=1))
+            _SESSION = session
+        return _SESSION
+
+def fetch_image(url, cancelled=None):
+    """Baixa uma imagem e a decodifica como QImage (seguro fora da thread da interface)"""
+    try:
+        # stream=True permite desistir após os cabeçalhos, sem baixar o corpo
+        with get_session().get(url, timeout=10, stream=True) as response:
+            if cancelled is not None and cancelled.is_set():
+                return QImage()
+            if response.status_code == 200:
+                return decode_scaled_image(response.content)
+    except Exception as e:
+        print(f"Erro ao baixar imagem: {str(e)}")
+    return QImage()
+
+def decode_scaled_image(data):
+    """Decodifica e reduz a imagem ao tamanho de exibição, fora da thread da interface"""
+    from PIL import Image as PILImage
     
-    def __init__(self, url, parent=None):
-        super().__init__(parent)
+    try:
+        img_pil = PILImage.open(BytesIO(data))
+        # thumbnail() só reduz e, para JPEG, já decodifica em escala menor
+        img_pil.thumbnail((IMAGE_WIDTH, IMAGE_HEIGHT), PILImage.LANCZOS)
+        if 'A' in img_pil.getbands() or 'transparency' in img_pil.info:
+            mode, fmt, channels = 'RGBA', QImage.Format.Format_RGBA8888, 4
+        else:
+            mode, fmt, channels = 'RGB', QImage.Format.Format_RGB888, 3
+        img_pil = img_pil.convert(mode)
+        buffer = img_pil.tobytes('raw', mode)
+        # copy() desvincula a imagem do buffer Python
+        return QImage(buffer, img_pil.width, img_pil.height, img_pil.width * channels, fmt).copy()
+    except Exception:
+        # Formatos que o PIL não abre ficam com o decodificador do Qt
+        return QImage.fromData(data)
+
+class ImageSignals(QObject):
+    """Sinais do ImageJob (QRunnable não herda de QObject)"""
+    image_ready = pyqtSignal(int, QImage)
+
+class ImageJob(QRunnable):
+    """Tarefa do pool de threads para baixar imagens sem bloquear a interface"""
+    def __init__(self, url, generation):
+        super().__init__()
         self.url = url
+        self.generation = generation
+        self.signals = ImageSignals()
+        self.cancelled = threading.Event()
     
     def run(self):
-        try:
-            response = requests.get(self.url, timeout=10)
-            if response.status_code == 200:
-                img_data = response.content
-                qimage = QImage.fromData(img_data)
-                pixmap = QPixmap.fromImage(qimage)
-                self.image_ready.emit(pixmap)
-            else:
-                self.image_ready.emit(QPixmap())
-        except Exception as e:
-            print(f"Erro ao baixar imagem: {str(e)}")
-            self.image_ready.emit(QPixmap())
-
-def create_qr_code(url, size=150):
-    """Cria um QR code para a URL fornecida e retorna como QPixmap"""
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+        if self.cancelled.is_set():
+            return
+        qimage = fetch_image(self.url, self.cancelled)
+        if not self.cancelled.is_set():
+            self.signals.image_ready.emit(self.generation, qimage)
+
+@lru_cache(maxsize=64)
+def _qr_image(url):
+    """Rasteriza o QR code uma única vez por URL, direto da matriz de módulos"""
+    import qrcode
+    
+    qr = qrcode.QRCode(version=1, border=5)
     qr.add_data(url)
     qr.make(fit=True)
     
-    img_pil = qr.make_image(fill_color="black", back_color="white")
-    
-    buffer = BytesIO()
-    img_pil.save(buffer, format='PNG')
-    buffer.seek(0)
+    # Empacota a matriz (já com a borda) em linhas de 1 bit por módulo
+    matrix = qr.get_matrix()
+    modules = len(matrix)
+    stride = (modules + 7) // 8
+    buffer = bytearray(stride * modules)
+    for y, row in enumerate(matrix):
+        for x, dark in enumerate(row):
+            if dark:
+                buffer[y * stride + x // 8] |= 0x80 >> (x % 8)
     
-    qimage = QImage.fromData(buffer.getvalue())
-    pixmap = QPixmap.fromImage(qimage)
+    # copy() desvincula a imagem do buffer Python antes de ajustar as cores
+    qimage = QImage(bytes(buffer), modules, modules, stride, QImage.Format.Format_Mono).copy()
+    qimage.setColorTable([QColor("white").rgb(), QColor("black").rgb()])
+    return qimage
+
+def create_qr_code(url, size=150):
+    """Cria um QR code para a URL fornecida e retorna como QPixmap"""
+    pixmap = QPixmap.fromImage(_qr_image(url))
     return pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio)
 
 class NewsCarousel(QWidget):
@@ -134,7 +247,11 @@ class NewsCarousel(QWidget):
         super().__init__(parent)
         self.news_entries = []
         self.current_index = 0
-        self.current_image_downloader = None
+        self.pool = QThreadPool.globalInstance()
+        self.image_generation = 0  # Descarta imagens de notícias que já saíram da tela
+        self.current_image_url = None
+        self.current_image_cancel = None  # Event do ImageJob em andamento
+        self._pixmap_cache = {}  # image_url -> pixmap já no tamanho de exibição
         
         self.layout = QVBoxLayout(self)
         self.setStyleSheet("""
@@ -203,14 +320,17 @@ class NewsCarousel(QWidget):
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.next_news)
         
-        # Iniciar o downloader
-        self.downloader = NewsDownloader()
+        # Iniciar o downloader (reaproveitado em todas as atualizações)
+        self.downloader = NewsDownloader(self)
         self.downloader.news_ready.connect(self.on_news_ready)
         self.downloader.start()
     
     def on_news_ready(self, entries):
         """Chamado quando as notícias são baixadas"""
         self.news_entries = entries
+        # Manter em cache apenas as imagens das notícias atuais
+        urls = {entry['image_url'] for entry in entries}
+        self._pixmap_cache = {url: pixmap for url, pixmap in self._pixmap_cache.items() if url in urls}
         if entries:
             self.current_index = 0
             self.update_display()
@@ -235,46 +355,60 @@ class NewsCarousel(QWidget):
         else:
             self.link_container.setVisible(False)
         
-        # Carregar a imagem de forma assíncrona
-        if entry['image_url']:
+        # Cancelar/invalidar qualquer download anterior ainda em andamento
+        self.image_generation += 1
+        if self.current_image_cancel is not None:
+            self.current_image_cancel.set()
+            self.current_image_cancel = None
+        self.current_image_url = entry['image_url']
+        
+        # Reutilizar a imagem já composta em uma volta anterior do carrossel
+        cached = self._pixmap_cache.get(entry['image_url'])
+        if cached is not None:
+            self.image_label.setPixmap(cached)
+        # Usar a imagem pré-carregada pelo NewsDownloader, se houver
+        elif 'image' in entry:
+            self.on_image_ready(QPixmap.fromImage(entry['image']))
+        # Caso contrário, carregar a imagem de forma assíncrona
+        elif entry['image_url']:
             self.image_label.setText("Carregando imagem...")
             
-            # Cancelar qualquer download anterior, se existir
-            if self.current_image_downloader is not None and self.current_image_downloader.isRunning():
-                self.current_image_downloader.terminate()
-            
-            # Iniciar um novo download
-            self.current_image_downloader = ImageDownloader(entry['image_url'])
-            self.current_image_downloader.image_ready.connect(self.on_image_ready)
-            self.current_image_downloader.start()
+            # Iniciar um novo download no pool de threads
+            job = ImageJob(entry['image_url'], self.image_generation)
+            job.signals.image_ready.connect(self.on_image_downloaded)
+            self.current_image_cancel = job.cancelled
+            self.pool.start(job)
         else:
             self.image_label.setText("Sem imagem disponível")
     
+    def on_image_downloaded(self, generation, qimage):
+        """Chamado quando um ImageJob termina; ignora resultados obsoletos"""
+        if generation == self.image_generation:
+            self.on_image_ready(QPixmap.fromImage(qimage))
+    
     def on_image_ready(self, pixmap):
         """Chamado quando a imagem é baixada"""
         if not pixmap.isNull():
-            # Calcular a proporção ideal de 3:4 mantendo o aspecto original
-            image_pixmap = pixmap.scaled(
-                IMAGE_WIDTH, 
-                IMAGE_HEIGHT,
-                Qt.AspectRatioMode.KeepAspectRatio,  # Mantém a proporção
-                Qt.TransformationMode.SmoothTransformation  # Qualidade alta
-            )
-            
-            # Criar um pixmap de fundo com tamanho e proporção exatos (3:4)
-            background = QPixmap(IMAGE_WIDTH, IMAGE_HEIGHT)
-            background.fill(QColor("#e0e0e0"))  # Cor de fundo cinza claro
-            
-            # Criar um painter para desenhar a imagem centralizada no fundo
-            painter = QPainter(background)
-            # Calcular a posição para centralizar a imagem
-            x = (IMAGE_WIDTH - image_pixmap.width()) // 2
-            y = (IMAGE_HEIGHT - image_pixmap.height()) // 2
-            painter.drawPixmap(x, y, image_pixmap)
-            painter.end()
+            # Imagens reduzidas em decode_scaled_image cabem nos limites e encostam em um deles;
+            # as que vieram sem redução (fallback do QImage) passam pelo scaled abaixo
+            width, height = pixmap.width(), pixmap.height()
+            if (width <= IMAGE_WIDTH and height <= IMAGE_HEIGHT
+                    and (width == IMAGE_WIDTH or height == IMAGE_HEIGHT)):
+                image_pixmap = pixmap
+            else:
+                # Calcular a proporção ideal de 3:4 mantendo o aspecto original
+                image_pixmap = pixmap.scaled(
+                    IMAGE_WIDTH, 
+                    IMAGE_HEIGHT,
+                    Qt.AspectRatioMode.KeepAspectRatio,  # Mantém a proporção
+                    Qt.TransformationMode.SmoothTransformation  # Qualidade alta
+                )
             
-            # Definir o pixmap combinado no label
-            self.image_label.setPixmap(background)
+            # O label já centraliza o pixmap sobre o fundo cinza do seu stylesheet,
+            # então não é preciso compor a imagem em um pixmap de fundo
+            self.image_label.setPixmap(image_pixmap)
+            if self.current_image_url:
+                self._pixmap_cache[self.current_image_url] = image_pixmap
             # Evitar distorção 
             self.image_label.setScaledContents(False)
         else:
@@ -288,9 +422,8 @@ class NewsCarousel(QWidget):
     
     def refresh_news(self):
         """Atualiza as notícias"""
-        self.downloader = NewsDownloader()
-        self.downloader.news_ready.connect(self.on_news_ready)
-        self.downloader.start()
+        if not self.downloader.isRunning():
+            self.downloader.start()
 
 class OverlayWidget(QWidget):
     def __init__(self, parent=None):
@@ -302,12 +435,23 @@ class OverlayWidget(QWidget):
         self.setStyleSheet("background: transparent;")  # Fundo transparente
         self.pos_x = 100
         self.pos_y = 100
-        self.dx = 2
-        self.dy = 2
+        # Passo de 4 px a cada 60 ms: mesma velocidade visual com metade dos ticks
+        self.dx = 4
+        self.dy = 4
+
+        # O hexágono e a fonte têm tamanho fixo: calculados uma única vez
+        radius = self.hex_size / 2
+        center_x, center_y = self.hex_size / 2, self.hex_size / 2
+        self._hexagon = QPolygonF([
+            QPointF(center_x + radius * math.cos(math.radians(60 * i - 30)),
+                    center_y + radius * math.sin(math.radians(60 * i - 30)))
+            for i in range(6)
+        ])
+        self._font = QFont("Arial", 25, QFont.Weight.Bold)
 
         self.anim_timer = QTimer(self)
         self.anim_timer.timeout.connect(self.update_position)
-        self.anim_timer.start(30)
+        self.anim_timer.start(60)
 
     def update_position(self):
         self.pos_x += self.dx
@@ -326,29 +470,18 @@ class OverlayWidget(QWidget):
             self.dy = -self.dy
             self.pos_y = max(0, min(self.pos_y, parent_height - self.hex_size))
 
+        # move() já agenda o repaint necessário; o conteúdo em si não muda
         self.move(self.pos_x, self.pos_y)
-        self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        radius = self.hex_size / 2
-        center_x, center_y = self.hex_size / 2, self.hex_size / 2
-        hexagon = QPolygonF()
-        for i in range(6):
-            angle_deg = 60 * i - 30
-            x = center_x + radius * math.cos(math.radians(angle_deg))
-            y = center_y + radius * math.sin(math.radians(angle_deg))
-            hexagon.append(QPointF(x, y))
-
         painter.setBrush(QColor("#1976d2"))
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawPolygon(hexagon)
+        painter.drawPolygon(self._hexagon)
 
-        font = QFont("Arial", 25)
-        font.setBold(True)
-        painter.setFont(font)
+        painter.setFont(self._font)
         painter.setPen(QColor("white"))
         painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Olá,\nUtilize o mouse\n para navegar\n em nosso \npainel interativo.")
 
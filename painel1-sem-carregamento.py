@@ -1,8 +1,7 @@
 import re
-from bs4 import BeautifulSoup  # Biblioteca para manipulação e limpeza de HTML
-import qrcode                # Biblioteca para gerar QR codes
-from io import BytesIO       # Para manipulação de fluxos de bytes
-from PIL import Image        # Biblioteca de processamento de imagens
+from html import unescape  # Decodifica entidades (&amp;) capturadas pela regex
+from selectolax.lexbor import LexborHTMLParser  # Parser HTML rápido (binding do Lexbor)
+import segno                 # Biblioteca para gerar QR codes
 
 import feedparser            # Biblioteca para ler feeds RSS
 from kivy.app import App      # Classe base para aplicativos Kivy
@@ -11,56 +10,72 @@ from kivy.core.window import Window  # Configurações da janela do app
 from kivy.graphics import Color, Rectangle  # Elementos gráficos
 from kivy.uix.boxlayout import BoxLayout  # Layout em caixa
 from kivy.uix.carousel import Carousel  # Componente de slides
-from kivy.uix.image import AsyncImage, Image as KivyImage  # Imagens assíncronas e sincronas no Kivy
 from kivy.uix.label import Label  # Rótulos de texto
 from kivy.metrics import dp  # Para definição de medidas independentes de densidade
-from kivy.uix.scrollview import ScrollView  # Permite rolagem de conteúdo
-from kivy.core.image import Image as CoreImage  # Para criar texturas a partir de imagens
+from kivy.graphics.texture import Texture  # Texturas criadas a partir de bytes brutos
+from kivy.lang import Builder  # Carrega a regra KV do slide
+from kivy.properties import StringProperty, ObjectProperty  # Propriedades ligadas à regra KV
 
 # URL do feed RSS e limites de caracteres para título e descrição
 FEED_URL = "https://fct.ufg.br/feed"
 TITLE_LIMIT = 80  # Limite de caracteres para o título
 DESC_LIMIT = 600  # Limite de caracteres para a descrição
 
+# Expressão regular pré-compilada para colapsar espaços em branco
+_WS_RE = re.compile(r'\s+')
+
+# Tabela de tradução dos módulos do QR code: 0 (claro) vira 255, o resto (escuro) vira 0
+_QR_LUT = bytes([255] + [0] * 255)
+QR_BORDER = 5  # Zona de silêncio, em módulos
+
+# Expressão regular para achar a primeira imagem sem montar a árvore HTML
+_IMG_SRC_RE = re.compile(r'<img\b[^>]*?\bsrc=["\']([^"\']+)["\']', re.IGNORECASE)
+
 def create_qr_code(url):
     """
     Cria um QR code para a URL fornecida e retorna como textura Kivy.
     """
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(url)
-    qr.make(fit=True)
+    # Gera a matriz do QR code (micro=False: leitores de celular nem sempre reconhecem Micro QR)
+    qr = segno.make(url, micro=False)
+    width, height = qr.symbol_size(scale=1, border=QR_BORDER)
     
-    # Gera a imagem do QR code utilizando PIL
-    img_pil = qr.make_image(fill_color="black", back_color="white")
+    # Um byte de luminância por módulo (0 = preto, 255 = branco), sem codificar PNG;
+    # translate() converte cada linha inteira em C, sem laço Python por módulo
+    margin = b'\xff' * QR_BORDER
+    quiet_rows = b'\xff' * (width * QR_BORDER)
+    pixels = b''.join([quiet_rows]
+                      + [margin + row.translate(_QR_LUT) + margin for row in qr.matrix]
+                      + [quiet_rows])
     
-    # Converte a imagem para um buffer de bytes em formato PNG
-    buffer = BytesIO()
-    img_pil.save(buffer, format='PNG')
-    buffer.seek(0)
-    
-    # Cria uma textura Kivy a partir do buffer
-    return CoreImage(BytesIO(buffer.read()), ext='png').texture
+    # Cria a textura Kivy direto dos bytes; 'nearest' mantém os módulos nítidos ao ampliar
+    texture = Texture.create(size=(width, height), colorfmt='luminance')
+    texture.blit_buffer(pixels, colorfmt='luminance', bufferfmt='ubyte')
+    texture.flip_vertical()  # A origem da textura fica embaixo; a matriz começa no topo
+    texture.mag_filter = 'nearest'
+    return texture
 
 def clean_text(html_content):
     """
-    Limpa e formata o texto HTML usando BeautifulSoup.
+    Limpa e formata o texto HTML usando selectolax.
     Remove tags desnecessárias e espaços extras.
     """
     if not html_content:
         return ""
     
-    # Converte o conteúdo HTML para um objeto BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Converte o conteúdo HTML em uma árvore do Lexbor
+    tree = LexborHTMLParser(html_content)
     
     # Remove as tags <script> e <style>
-    for script in soup(["script", "style"]):
+    for script in tree.css("script, style"):
         script.decompose()
     
-    # Extrai o texto, separando elementos com um espaço
-    text = soup.get_text(separator=' ', strip=True)
+    # Extrai o texto do corpo, separando elementos com um espaço
+    if tree.body is None:
+        return ""
+    text = tree.body.text(separator=' ', strip=True)
     
     # Remove espaços extras e quebras de linha usando regex
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     return text.strip()
 
 def truncate_text(text, limit):
@@ -87,13 +102,12 @@ def fix_image_url(url):
 
 def extract_image(description):
     """
-    Extrai a primeira imagem válida da descrição usando BeautifulSoup.
+    Extrai a primeira imagem válida da descrição com uma regex pré-compilada.
     Se encontrada, corrige a URL com fix_image_url.
     """
-    soup = BeautifulSoup(description, 'html.parser')
-    img_tag = soup.find('img')
-    if img_tag and img_tag.get('src'):
-        return fix_image_url(img_tag['src'])
+    match = _IMG_SRC_RE.search(description or '')
+    if match:
+        return fix_image_url(unescape(match.group(1)))
     return None
 
 class Header(BoxLayout):
@@ -135,150 +149,145 @@ class Header(BoxLayout):
         self.rect.pos = self.pos
         self.rect.size = self.size
 
+# Regra KV do slide: a hierarquia e os vínculos de layout são compilados uma única vez
+# e aplicados a cada instância, sem criar widgets nem callbacks Python por slide
+Builder.load_string('''
+<NewsSlide>:
+    orientation: 'horizontal'
+    padding: [dp(20), dp(20)]
+    spacing: dp(20)
+
+    # Container da imagem (lado esquerdo)
+    BoxLayout:
+        id: image_container
+        orientation: 'vertical'
+        size_hint_x: 0.4
+
+        # Imagem assíncrona para evitar bloqueio da interface
+        AsyncImage:
+            id: image
+            source: root.image_url
+            size_hint: 1, 1
+            fit_mode: 'contain'
+
+        # Placeholder exibido quando a notícia não tem imagem
+        Label:
+            id: no_image
+            text: 'Sem imagem disponível'
+            color: 0.5, 0.5, 0.5, 1
+
+    # Container de texto (lado direito) com rolagem vertical
+    ScrollView:
+        size_hint_x: 0.6
+        do_scroll_x: False
+        do_scroll_y: False
+
+        BoxLayout:
+            id: text_layout
+            orientation: 'vertical'
+            spacing: dp(15)
+            size_hint_y: None
+            height: self.minimum_height
+            padding: [0, 0, 0, dp(120)]  # Padding inferior para espaço extra
+
+            Label:
+                text: root.title_text
+                font_size: dp(28)
+                bold: True
+                color: 0, 0, 0, 1
+                size_hint_y: None
+                height: dp(80)
+                halign: 'justify'
+                valign: 'middle'
+                text_size: self.width, None
+
+            Label:
+                text: root.desc_text
+                font_size: dp(26)
+                color: 0, 0, 0, 0.8
+                size_hint_y: None
+                height: self.texture_size[1]
+                halign: 'justify'
+                valign: 'top'
+                text_size: self.width, None
+
+            # Espaçador para separar visualmente os elementos
+            BoxLayout:
+                size_hint_y: None
+                height: dp(20)
+
+            # Container com "Leia mais" e QR code
+            BoxLayout:
+                id: bottom_container
+                orientation: 'horizontal'
+                size_hint_y: None
+                height: dp(100)
+                spacing: dp(6)
+                pos_hint: {'right': 1}  # Alinha à direita
+
+                BoxLayout:
+                    orientation: 'vertical'
+                    size_hint_x: 3.5
+
+                    Label:
+                        text: 'Leia mais em:'
+                        font_size: dp(22)
+                        color: 0.1, 0.1, 0.8, 1
+                        size_hint_y: None
+                        height: dp(30)
+                        halign: 'right'
+                        valign: 'bottom'
+                        text_size: self.width, None
+
+                    Label:
+                        text: root.link
+                        font_size: dp(16)
+                        color: 0.1, 0.1, 0.8, 1
+                        size_hint_y: None
+                        height: dp(70)
+                        halign: 'right'
+                        valign: 'top'
+                        text_size: self.width, None
+
+                # A textura tem 1 px por módulo: ampliar até o espaço
+                Image:
+                    texture: root.qr_texture
+                    size_hint_x: 0.4
+                    fit_mode: 'contain'
+''')
+
 class NewsSlide(BoxLayout):
     """
     Classe que representa um slide de notícia.
     Organiza a imagem e o texto (título, descrição, link e QR code) em dois containers.
+    O layout vem da regra KV <NewsSlide>; aqui apenas se preenchem as propriedades.
     """
+    title_text = StringProperty('')
+    desc_text = StringProperty('')
+    link = StringProperty('')
+    image_url = StringProperty('')
+    qr_texture = ObjectProperty(None, allownone=True)
+
     def __init__(self, entry, **kwargs):
         super().__init__(**kwargs)
-        self.orientation = "horizontal"
-        self.padding = [dp(20), dp(20)]
-        self.spacing = dp(20)
         
-        # Container da imagem (lado esquerdo)
-        image_container = BoxLayout(
-            orientation='vertical',
-            size_hint_x=0.4
-        )
+        # Título e descrição da notícia, processados e truncados
+        self.title_text = truncate_text(clean_text(entry.get("title", "")), TITLE_LIMIT)
+        self.desc_text = truncate_text(clean_text(entry.get("description", "")), DESC_LIMIT)
+        self.link = entry.get("link", "")
+        self.image_url = extract_image(entry.get("description", "")) or ""
         
-        # Extrai a URL da imagem da notícia
-        image_url = extract_image(entry.get("description", ""))
-        if image_url:
-            # Exibe a imagem de forma assíncrona para evitar bloqueio da interface
-            img = AsyncImage(
-                source=image_url,
-                size_hint=(1, 1),
-                fit_mode='contain'
-            )
-            image_container.add_widget(img)
+        # Mantém apenas a imagem ou o placeholder, conforme a notícia
+        if self.image_url:
+            self.ids.image_container.remove_widget(self.ids.no_image)
         else:
-            # Se não houver imagem, exibe um placeholder com texto informativo
-            placeholder = Label(
-                text="Sem imagem disponível",
-                color=(0.5, 0.5, 0.5, 1)
-            )
-            image_container.add_widget(placeholder)
-        
-        self.add_widget(image_container)
-        
-        # Container de texto (lado direito) com rolagem vertical
-        text_container = ScrollView(
-            size_hint_x=0.6,
-            do_scroll_x=False,
-            do_scroll_y=False
-        )
-        
-        # Layout interno do container de texto
-        text_layout = BoxLayout(
-            orientation='vertical',
-            spacing=dp(15),
-            size_hint_y=None,
-            padding=[0, 0, 0, dp(120)]  # Padding inferior para espaço extra
-        )
-        text_layout.bind(minimum_height=text_layout.setter('height'))
-        
-        # Título da notícia, processado e truncado
-        title_text = truncate_text(clean_text(entry.get("title", "")), TITLE_LIMIT)
-        title_label = Label(
-            text=title_text,
-            font_size=dp(28),
-            bold=True,
-            color=(0, 0, 0, 1),
-            size_hint_y=None,
-            height=dp(80),
-            halign='justify',
-            valign='middle'
-        )
-        title_label.bind(size=lambda *_: setattr(title_label, 'text_size', (title_label.width, None)))
-        text_layout.add_widget(title_label)
+            self.ids.image_container.remove_widget(self.ids.image)
         
-        # Descrição da notícia, processada e truncada
-        desc_text = truncate_text(clean_text(entry.get("description", "")), DESC_LIMIT)
-        desc_label = Label(
-            text=desc_text,
-            font_size=dp(26),
-            color=(0, 0, 0, 0.8),
-            size_hint_y=None,
-            halign='justify',
-            valign='top'
-        )
-        desc_label.bind(
-            size=lambda *_: setattr(desc_label, 'text_size', (desc_label.width, None)),
-            texture_size=lambda *_: setattr(desc_label, 'height', desc_label.texture_size[1])
-        )
-        text_layout.add_widget(desc_label)
-        
-        # Espaçador para separar visualmente os elementos
-        spacer = BoxLayout(size_hint_y=None, height=dp(20))
-        text_layout.add_widget(spacer)
-        
-        # Se houver link, adiciona o container com "Leia mais" e QR code
-        link = entry.get("link", "")
-        if link:
-            bottom_container = BoxLayout(
-                orientation='horizontal',
-                size_hint_y=None,
-                height=dp(100),
-                spacing=dp(6),
-                pos_hint={'right': 1}  # Alinha à direita
-            )
-            
-            # Container para exibir o texto "Leia mais em:" e o link
-            read_more_container = BoxLayout(
-                orientation='vertical',
-                size_hint_x=3.5
-            )
-            
-            read_more_label = Label(
-                text="Leia mais em:",
-                font_size=dp(22),
-                color=(0.1, 0.1, 0.8, 1),
-                size_hint_y=None,
-                height=dp(30),
-                halign='right',
-                valign='bottom'
-            )
-            read_more_label.bind(size=lambda *_: setattr(read_more_label, 'text_size', (read_more_label.width, None)))
-            
-            link_label = Label(
-                text=link,
-                font_size=dp(16),
-                color=(0.1, 0.1, 0.8, 1),
-                size_hint_y=None,
-                height=dp(70),
-                halign='right',
-                valign='top'
-            )
-            link_label.bind(size=lambda *_: setattr(link_label, 'text_size', (link_label.width, None)))
-            
-            read_more_container.add_widget(read_more_label)
-            read_more_container.add_widget(link_label)
-            
-            # Gera o QR code e cria a imagem correspondente
-            qr_texture = create_qr_code(link)
-            qr_image = KivyImage(
-                texture=qr_texture,
-                size_hint_x=0.4
-            )
-            
-            # Adiciona o container com o link e o QR code ao layout inferior
-            bottom_container.add_widget(read_more_container)
-            bottom_container.add_widget(qr_image)
-            text_layout.add_widget(bottom_container)
-        
-        text_container.add_widget(text_layout)
-        self.add_widget(text_container)
+        # Sem link, não há "Leia mais" nem QR code
+        if self.link:
+            self.qr_texture = create_qr_code(self.link)
+        else:
+            self.ids.text_layout.remove_widget(self.ids.bottom_container)
 
 class NoticiasApp(App):
     """
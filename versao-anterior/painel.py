@@ -1,22 +1,30 @@
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.carousel import Carousel
-from kivy.properties import StringProperty, ListProperty, BooleanProperty
+from kivy.properties import StringProperty, ListProperty, BooleanProperty, ObjectProperty
 from kivy.clock import Clock
 from kivy.lang import Builder
 from kivy.config import Config
 from kivy.uix.image import AsyncImage
+from kivy.core.image import Image as CoreImage
 from kivy.animation import Animation
 from kivy.core.window import Window
 
-import feedparser
-from bs4 import BeautifulSoup
+import requests
+from lxml import etree
+from selectolax.lexbor import LexborHTMLParser
 import logging
-import locale
+import re
+from html import unescape
 from datetime import datetime
 from urllib.parse import urljoin
-import qrcode
+import segno
 import os
+import time
+from pathlib import Path
+import itertools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from email.utils import parsedate_to_datetime
 
 # Configuração inicial para tela cheia
@@ -26,10 +34,30 @@ Config.write()  # Salva as configurações
 
 # Configurações gerais
 logging.basicConfig(level=logging.INFO)
-try:
-    locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
-except locale.Error as e:
-    logging.warning("Locale pt_BR.UTF-8 não está disponível, usando configuração padrão.")
+
+# Primeira imagem da descrição, sem precisar da árvore HTML
+_IMG_SRC_RE = re.compile(r'<img\b[^>]*?\bsrc=["\']([^"\']+)["\']', re.IGNORECASE)
+
+PLACEHOLDER_IMAGEM = 'assets/placeholder.png'
+_textura_placeholder = None
+
+def textura_placeholder():
+    """Carrega a textura do placeholder uma única vez e a compartilha entre os slides"""
+    global _textura_placeholder
+    if _textura_placeholder is None:
+        try:
+            _textura_placeholder = CoreImage(PLACEHOLDER_IMAGEM).texture
+        except Exception as e:
+            logging.warning(f"Placeholder indisponível: {e}")
+    return _textura_placeholder
+
+# Parágrafos de crédito que não entram no resumo da notícia
+_MARCADORES = ('texto:', 'foto:')
+
+# Busca o feed fora da thread do Kivy, para não travar a renderização
+pool_carregamento = ThreadPoolExecutor(max_workers=2)
+# Processa as notícias em paralelo (parse do HTML e gravação dos QR codes)
+pool_processamento = ThreadPoolExecutor(max_workers=4)
 
 class RootWidget(BoxLayout):
     pass
@@ -40,18 +68,27 @@ class NewsItem(BoxLayout):
     image_source = StringProperty('')
     pub_date = StringProperty('')
     qr_code = StringProperty('')
+    placeholder_texture = ObjectProperty(None, allownone=True)
+    usa_placeholder = BooleanProperty(True)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        Clock.schedule_once(self._finalizar_inicializacao)
+        self.placeholder_texture = textura_placeholder()
+        self.on_image_source(self, self.image_source)
 
-    def _finalizar_inicializacao(self, dt):
-        if not self.image_source:
-            self.image_source = 'assets/placeholder.png'
+    def on_image_source(self, instance, value):
+        # Sem imagem própria, o KV mostra a textura compartilhada em vez da AsyncImage
+        self.usa_placeholder = value in ('', PLACEHOLDER_IMAGEM)
 
 class NewsCarousel(Carousel):
     news_items = ListProperty([])
     BASE_URL = 'https://fct.ufg.br'
+    FEED_URL = 'https://fct.ufg.br/feed'
+    MAX_NOTICIAS = 5
+    LIMITE_CONTEUDO = 1000  # Caracteres do resumo exibido no slide
+    TAMANHO_BLOCO = 16384  # Bytes lidos da rede por vez ao baixar o feed
+    INTERVALO_SLIDES = 10  # Segundos entre trocas automáticas de slide
+    INTERVALO_ATUALIZACAO = 300  # Segundos entre buscas do feed
     auto_advance = BooleanProperty(True)
 
     def __init__(self, **kwargs):
@@ -61,41 +98,53 @@ class NewsCarousel(Carousel):
         self.anim_type = 'in_out_expo'
         self.anim_move_duration = 0.7
         self.min_move = 0.05
-        self.qr_dir = 'qrcodes'
+        self.qr_dir = Path('qrcodes')
+        self._carregamento = None  # Future da busca em andamento
+        self._qr_cache = {}  # URL -> caminho do PNG já gerado
+        self._slides_noticias = []  # NewsItem reaproveitados entre atualizações
+        self._feed_etag = None  # Validadores HTTP da última resposta do feed
+        self._feed_modified = None
+        # Prazos (time.monotonic) verificados em tick(); None pausa os slides
+        agora = time.monotonic()
+        self._proximo_slide = agora + self.INTERVALO_SLIDES
+        self._proxima_atualizacao = agora + self.INTERVALO_ATUALIZACAO
         
-        os.makedirs(self.qr_dir, exist_ok=True)
+        self.qr_dir.mkdir(exist_ok=True)
         
-        # Inicializa o carregamento de notícias
+        # Inicializa o carregamento de notícias; as repetições vêm de tick()
         Clock.schedule_once(self.carregar_noticias)
-        Clock.schedule_interval(self.carregar_noticias, 300)
-        
-        # Agenda o primeiro slide automático com um pequeno atraso
-        Clock.schedule_once(lambda dt: self.iniciar_slides_automaticos(), 2)
         
         # Vincula eventos de tela cheia
         Window.bind(on_resize=self._on_window_resize)
         Window.bind(on_maximize=self._on_window_maximize)
 
+    def tick(self):
+        """Chamado a cada segundo pelo relógio do app, o único evento recorrente do painel"""
+        agora = time.monotonic()
+        if agora >= self._proxima_atualizacao:
+            self._proxima_atualizacao = agora + self.INTERVALO_ATUALIZACAO
+            self.carregar_noticias()
+        if self._proximo_slide is not None and agora >= self._proximo_slide:
+            self._proximo_slide = agora + self.INTERVALO_SLIDES
+            self.passar_slide_automatico(None)
+
     def _on_window_resize(self, instance, width, height):
         """Manipula eventos de redimensionamento da janela"""
-        Clock.unschedule(self.passar_slide_automatico)
-        Clock.schedule_once(lambda dt: self.iniciar_slides_automaticos(), 1)
+        self.iniciar_slides_automaticos()
 
     def _on_window_maximize(self, instance):
         """Manipula eventos de maximização da janela"""
-        Clock.unschedule(self.passar_slide_automatico)
-        Clock.schedule_once(lambda dt: self.iniciar_slides_automaticos(), 1)
+        self.iniciar_slides_automaticos()
 
     def iniciar_slides_automaticos(self):
         """Inicia ou reinicia a apresentação automática de slides"""
         if self.auto_advance:
-            Clock.unschedule(self.passar_slide_automatico)
-            Clock.schedule_interval(self.passar_slide_automatico, 10)
+            self._proximo_slide = time.monotonic() + self.INTERVALO_SLIDES
             logging.info("Apresentação automática de slides iniciada/reiniciada")
 
     def pausar_slides_automaticos(self):
         """Pausa a apresentação automática de slides"""
-        Clock.unschedule(self.passar_slide_automatico)
+        self._proximo_slide = None
         logging.info("Apresentação automática de slides pausada")
 
     def passar_slide_automatico(self, dt):
@@ -120,20 +169,24 @@ class NewsCarousel(Carousel):
             logging.error(f"Erro ao passar slide: {e}")
             return False
 
-    def gerar_qr_code(self, url, news_id):
+    def gerar_qr_code(self, url):
+        if url in self._qr_cache:
+            return self._qr_cache[url]
+        # O nome do arquivo deriva da URL, então um PNG existente já está correto
+        chave = hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+        caminho_qr = self.qr_dir / f'qr_{chave}.png'
+        if caminho_qr.exists():
+            self._qr_cache[url] = str(caminho_qr)
+            return str(caminho_qr)
         try:
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(url)
-            qr.make(fit=True)
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            caminho_qr = os.path.join(self.qr_dir, f'qr_{news_id}.png')
-            qr_img.save(caminho_qr)
-            return caminho_qr
+            # Grava em um arquivo temporário e renomeia de forma atômica, para que
+            # a AsyncImage nunca leia um PNG pela metade
+            temporario = caminho_qr.with_suffix('.png.tmp')
+            # micro=False: leitores de celular nem sempre reconhecem Micro QR
+            segno.make(url, error='l', micro=False).save(str(temporario), kind='png', scale=10, border=4)
+            os.replace(temporario, caminho_qr)
+            self._qr_cache[url] = str(caminho_qr)
+            return str(caminho_qr)
         except Exception as e:
             logging.error(f"Erro no QR code: {e}")
             return ''
@@ -141,14 +194,15 @@ class NewsCarousel(Carousel):
     def formatar_data(self, data_str):
         try:
             data = parsedate_to_datetime(data_str)
-            return data.strftime('%d/%m/%Y')
+            # Formatação direta dos inteiros, sem passar pelo strftime
+            return f'{data.day:02d}/{data.month:02d}/{data.year}'
         except Exception as e:
             logging.error(f"Erro na formatação da data: {e}")
             return data_str
 
     def corrigir_url_imagem(self, url):
         if not url:
-            return 'assets/placeholder.png'
+            return PLACEHOLDER_IMAGEM
         if url.startswith("http://fct.ufg.brhttps://"):
             url = url.replace("http://fct.ufg.br", "")
         if not url.startswith(('http://', 'https://')):
@@ -156,54 +210,127 @@ class NewsCarousel(Carousel):
         return url
 
     def extrair_conteudo_principal(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
-        img_tag = soup.find('img')
-        img_url = self.corrigir_url_imagem(img_tag['src']) if img_tag else None
+        img_match = _IMG_SRC_RE.search(html)
+        img_url = self.corrigir_url_imagem(unescape(img_match.group(1))) if img_match else None
+        
+        tree = LexborHTMLParser(html)
+        
+        def paragrafos_validos():
+            # traverse() percorre a árvore sob demanda: a busca por <p> para assim
+            # que o islice abaixo tiver os parágrafos necessários, e o texto de
+            # cada <p> é extraído uma única vez
+            for p in tree.root.traverse():
+                if p.tag != 'p':
+                    continue
+                texto = p.text().strip()
+                minusculo = texto.lower()
+                if texto and not any(m in minusculo for m in _MARCADORES):
+                    yield texto
         
-        texto_principal = [
-            p.get_text().strip() for p in soup.find_all('p') 
-            if p.get_text().strip() and not any(m in p.get_text().lower() for m in ['texto:', 'foto:'])
-        ]
+        # Junta os parágrafos sem nunca montar mais que LIMITE_CONTEUDO caracteres
+        partes = []
+        restante = self.LIMITE_CONTEUDO
+        truncado = False
+        for texto in itertools.islice(paragrafos_validos(), 5):
+            if partes:
+                restante -= 1  # Espaço separador
+            if len(texto) > restante:
+                if restante >= 0:
+                    partes.append(texto[:restante])
+                truncado = True
+                break
+            partes.append(texto)
+            restante -= len(texto)
         
-        conteudo = ' '.join(texto_principal[:5])
-        if len(conteudo) > 1000:
-            conteudo = conteudo[:1000] + '...'
+        conteudo = ' '.join(partes)
+        if truncado:
+            conteudo += '...'
         return conteudo, img_url
 
+    def ler_feed(self, blocos):
+        """Lê os itens do RSS à medida que os blocos chegam, parando ao atingir o limite"""
+        parser = etree.XMLPullParser(events=('end',), tag='item')
+        entradas = []
+        for bloco in blocos:
+            parser.feed(bloco)
+            for _, item in parser.read_events():
+                entradas.append({
+                    'title': item.findtext('title') or '',
+                    'description': item.findtext('description') or '',
+                    'link': item.findtext('link') or '',
+                    'published': item.findtext('pubDate'),
+                })
+                item.clear()
+                # O restante do feed nem chega a ser baixado
+                if len(entradas) == self.MAX_NOTICIAS:
+                    return entradas
+        return entradas
+
+    def processar_entrada(self, entrada):
+        conteudo, img_url = self.extrair_conteudo_principal(entrada['description'])
+        titulo = entrada['title'] if len(entrada['title']) <= 80 else entrada['title'][:80] + '...'
+        pub_date = self.formatar_data(entrada['published']) if entrada['published'] else ''
+        return {
+            'title': titulo,
+            'content': conteudo,
+            'image_source': img_url or PLACEHOLDER_IMAGEM,
+            'pub_date': pub_date,
+            'qr_code': self.gerar_qr_code(entrada['link'])
+        }
+
     def carregar_noticias(self, *args):
+        # Evita empilhar buscas se a anterior ainda não terminou
+        if self._carregamento is not None and not self._carregamento.done():
+            return
+        self._carregamento = pool_carregamento.submit(self._buscar_noticias)
+
+    def _buscar_noticias(self):
+        """Executa em segundo plano; os slides são criados de volta na thread do Kivy"""
+        # GET condicional: o servidor responde 304 se o feed não mudou
+        cabecalhos = {}
+        if self._feed_etag:
+            cabecalhos['If-None-Match'] = self._feed_etag
+        if self._feed_modified:
+            cabecalhos['If-Modified-Since'] = self._feed_modified
         try:
-            feed = feedparser.parse('https://fct.ufg.br/feed')
-            noticias_processadas = []
-            
-            for idx, entrada in enumerate(feed.entries[:5]):
-                conteudo, img_url = self.extrair_conteudo_principal(entrada.get('description', ''))
-                titulo = entrada.title if len(entrada.title) <= 80 else entrada.title[:80] + '...'
-                pub_date = self.formatar_data(entrada.published) if 'published' in entrada else ''
-                noticias_processadas.append({
-                    'title': titulo,
-                    'content': conteudo,
-                    'image_source': img_url or 'assets/placeholder.png',
-                    'pub_date': pub_date,
-                    'qr_code': self.gerar_qr_code(entrada.link, idx)
-                })
-            
-            self.news_items = noticias_processadas
-            self._criar_slides()
-            
+            with requests.get(self.FEED_URL, headers=cabecalhos, timeout=10, stream=True) as resposta:
+                if resposta.status_code == 304:
+                    return
+                resposta.raise_for_status()
+                entradas = self.ler_feed(resposta.iter_content(chunk_size=self.TAMANHO_BLOCO))
+            noticias_processadas = list(pool_processamento.map(self.processar_entrada, entradas))
+            self._feed_etag = resposta.headers.get('ETag')
+            self._feed_modified = resposta.headers.get('Last-Modified')
         except Exception as e:
             logging.error(f"Erro ao carregar notícias: {e}")
+            return
+        
+        Clock.schedule_once(lambda dt: self._aplicar_noticias(noticias_processadas))
+
+    def _aplicar_noticias(self, noticias_processadas):
+        self.news_items = noticias_processadas
+        self._criar_slides()
 
     def _criar_slides(self):
-        self.clear_widgets()
-        for item in self.news_items:
-            self.add_widget(NewsItem(**item))
+        # Só cria ou remove widgets quando a quantidade de notícias muda
+        while len(self._slides_noticias) < len(self.news_items):
+            slide = NewsItem()
+            self._slides_noticias.append(slide)
+            self.add_widget(slide)
+        while len(self._slides_noticias) > len(self.news_items):
+            self.remove_widget(self._slides_noticias.pop())
+        
+        # StringProperty só dispara as regras do KV quando o valor muda de fato
+        for slide, item in zip(self._slides_noticias, self.news_items):
+            for campo, valor in item.items():
+                setattr(slide, campo, valor)
 
 class NewsPanel(App):
     clock_text = StringProperty('')
     
     def build(self):
         self.title = 'Painel FCT/UFG'
-        Clock.schedule_interval(self.atualizar_relogio, 1)
+        self.atualizar_relogio(0)
         
         # Configura a janela para tela cheia
         Window.borderless = True
@@ -212,7 +339,13 @@ class NewsPanel(App):
         return Builder.load_file('painel.kv')
     
     def atualizar_relogio(self, dt):
-        self.clock_text = datetime.now().strftime("%H:%M:%S")
+        agora = datetime.now()
+        self.clock_text = agora.strftime("%H:%M:%S")
+        # O mesmo tick conduz a troca de slides e a atualização do feed
+        if self.root is not None:
+            self.root.ids.carousel.tick()
+        # Agenda o próximo tick para logo após a virada do segundo, sem acumular atraso
+        Clock.schedule_once(self.atualizar_relogio, 1 - agora.microsecond / 1_000_000)
 
 if __name__ == '__main__':
     NewsPanel().run()
\ No newline at end of file